@@ -0,0 +1,61 @@
+import numpy as np
+from numba import njit
+
+NOISE = -1
+UNVISITED = -2
+
+# Serial on purpose: the inputs are at most 100 points, and the parallel threading
+# layers are not safe to enter from several asyncio.to_thread workers at once
+@njit(cache=True, nogil=True)
+def dbscan(X, eps, min_samples):
+    """Cluster the rows of X with DBSCAN, returning labels (-1 marks noise)"""
+    n, n_features = X.shape
+    eps2 = eps * eps
+
+    # Neighbor lists in a flat buffer: row i lives at neighbors[i*n : i*n + counts[i]]
+    neighbors = np.empty(n * n, dtype=np.int32)
+    counts = np.zeros(n, dtype=np.int32)
+
+    for i in range(n):
+        c = 0
+        for j in range(n):
+            d2 = 0.0
+            for k in range(n_features):
+                diff = X[i, k] - X[j, k]
+                d2 += diff * diff
+            if d2 <= eps2:
+                neighbors[i * n + c] = j
+                c += 1
+        counts[i] = c
+
+    labels = np.full(n, UNVISITED, dtype=np.int64)
+    stack = np.empty(n, dtype=np.int32)
+    cluster = 0
+
+    for i in range(n):
+        if labels[i] != UNVISITED:
+            continue
+        if counts[i] < min_samples:
+            labels[i] = NOISE
+            continue
+
+        # Expand a new cluster from core point i
+        labels[i] = cluster
+        stack[0] = i
+        top = 1
+        while top > 0:
+            top -= 1
+            p = stack[top]
+            for m in range(counts[p]):
+                q = neighbors[p * n + m]
+                if labels[q] == NOISE:
+                    # Border point, reachable but not expanded
+                    labels[q] = cluster
+                elif labels[q] == UNVISITED:
+                    labels[q] = cluster
+                    if counts[q] >= min_samples:
+                        stack[top] = q
+                        top += 1
+        cluster += 1
+
+    return labels
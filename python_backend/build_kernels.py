@@ -0,0 +1,21 @@
+"""Ahead-of-time compile the Numba DBSCAN kernel into the _threat_kernels extension.
+
+Run once per environment (npm run build:kernels) so the API server imports
+the compiled kernel instead of JIT-compiling it on the first request. pycc needs
+setuptools at build time, which the "build" dependency group provides.
+
+numba.pycc has been pending deprecation since Numba 0.57 and still warns in the
+locked 0.68. If it is removed, the server falls back to the cached JIT kernel.
+"""
+import os
+from numba.pycc import CC
+from _dbscan_numba import dbscan
+
+cc = CC('_threat_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Export the pure-Python source of the JIT kernel
+cc.export('dbscan', 'i8[:](f8[:, :], f8, i8)')(dbscan.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
@@ -0,0 +1,43 @@
+import numpy as np
+from _dbscan_numba import dbscan
+
+def test_separates_two_clusters_and_noise():
+    X = np.array([
+        [0.0, 0.0], [0.0, 0.1], [0.1, 0.0],
+        [5.0, 5.0], [5.0, 5.1], [5.1, 5.0],
+        [10.0, 10.0],
+    ])
+    labels = dbscan(X, 0.5, 3)
+    np.testing.assert_array_equal(labels, [0, 0, 0, 1, 1, 1, -1])
+
+def test_border_point_seen_before_its_core_joins_the_cluster():
+    # Point 0 has only 2 neighbors (itself and point 3), so it is first marked
+    # noise and must be relabeled as a border point when the cluster expands
+    X = np.array([[0.6, 0.0], [0.0, 0.0], [0.0, 0.3], [0.3, 0.0]])
+    labels = dbscan(X, 0.5, 3)
+    np.testing.assert_array_equal(labels, [0, 0, 0, 0])
+
+def test_border_point_is_not_expanded():
+    # Point 4 reaches only one core point (point 0) plus point 5, so it is a
+    # border point; point 5 is within eps of point 4 only and must stay noise
+    X = np.array([
+        [0.0, 0.0], [-0.2, 0.0], [-0.1, 0.15], [-0.1, -0.15],
+        [0.45, 0.0],
+        [0.9, 0.0],
+    ])
+    labels = dbscan(X, 0.5, 4)
+    np.testing.assert_array_equal(labels, [0, 0, 0, 0, 0, -1])
+
+def test_all_noise():
+    X = np.array([[0.0, 0.0, 0.0], [2.0, 0.0, 0.0], [0.0, 2.0, 0.0], [0.0, 0.0, 2.0]])
+    labels = dbscan(X, 0.5, 3)
+    np.testing.assert_array_equal(labels, [-1, -1, -1, -1])
+
+def test_min_samples_counts_the_point_itself():
+    X = np.array([[0.0, 0.0], [0.0, 0.4], [0.4, 0.0]])
+    np.testing.assert_array_equal(dbscan(X, 0.5, 3), [0, 0, 0])
+    np.testing.assert_array_equal(dbscan(X, 0.5, 4), [-1, -1, -1])
+
+def test_eps_boundary_is_inclusive():
+    X = np.array([[0.0, 0.0], [0.5, 0.0], [1.0, 0.0]])
+    np.testing.assert_array_equal(dbscan(X, 0.5, 2), [0, 0, 0])
@@ -0,0 +1,94 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from threat_analyzer import PositionHistory, SatellitePosition, Severity, ThreatAnalyzer, ThreatEvent
+
+THREAT_TYPES = ["VELOCITY_ANOMALY", "TRAJECTORY_ANOMALY", "PROXIMITY_WARNING"]
+
+def make_threat(i, timestamp, rng):
+    return ThreatEvent(
+        id=f"threat_{i}",
+        timestamp=timestamp,
+        source_lat=0.0, source_lon=0.0, target_lat=0.0, target_lon=0.0,
+        threat_type=THREAT_TYPES[rng.integers(len(THREAT_TYPES))],
+        severity=Severity(rng.integers(1, 5)),
+    )
+
+def add_threats_at(analyzer, ages, seed=0):
+    """Add one threat per age (in seconds before now), in the given order"""
+    rng = np.random.default_rng(seed)
+    now = datetime.now(timezone.utc)
+    for i, age in enumerate(ages):
+        # Keep clear of whole-hour ages so the cutoffs in the analyzer and in the
+        # brute-force check, taken moments apart, agree on every threat
+        if abs(age / 3600 - round(age / 3600)) * 3600 < 60:
+            age += 120
+        analyzer.add_threat_event(make_threat(i, now - timedelta(seconds=age), rng))
+
+def fill_with_shuffled_threats(analyzer, n, hours, seed=0):
+    """Add n threats at random times over the last `hours` hours, out of order"""
+    rng = np.random.default_rng(seed)
+    add_threats_at(analyzer, rng.uniform(0, hours * 3600, n), seed)
+
+def test_statistics_match_a_brute_force_count_after_eviction():
+    analyzer = ThreatAnalyzer()
+    fill_with_shuffled_threats(analyzer, 1500, hours=30)
+    assert len(analyzer.threat_events) == 1000
+    assert sum(map(len, analyzer._hourly_threats.values())) == 1000
+
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
+    recent = [t for t in analyzer.threat_events if t.timestamp >= cutoff]
+    severities = Counter(t.severity for t in recent)
+
+    stats = analyzer._compute_threat_statistics()
+    assert stats['total_threats_24h'] == len(recent) == len(analyzer.get_recent_threats(24))
+    assert stats['critical_threats'] == severities[Severity.CRITICAL]
+    assert stats['high_threats'] == severities[Severity.HIGH]
+    assert stats['medium_threats'] == severities[Severity.MEDIUM]
+    assert stats['low_threats'] == severities[Severity.LOW]
+    assert stats['threat_by_type'] == dict(Counter(t.threat_type for t in recent))
+
+def test_recent_threats_match_a_scan_with_late_arrivals():
+    # Mostly chronological, but every 7th threat is backdated by up to 3 hours,
+    # as anomaly threats are when they carry the position's timestamp
+    rng = np.random.default_rng(1)
+    ages = np.linspace(30 * 3600, 0, 1500)
+    ages[::7] += rng.uniform(0, 3 * 3600, len(ages[::7]))
+    analyzer = ThreatAnalyzer()
+    add_threats_at(analyzer, ages)
+    assert len(analyzer.threat_events) == 1000
+
+    for hours in (1, 6, 12, 24, 48):
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
+        expected = [t for t in analyzer.threat_events if t.timestamp >= cutoff]
+        assert analyzer.get_recent_threats(hours) == expected
+
+def test_recent_threats_match_a_scan_when_shuffled():
+    analyzer = ThreatAnalyzer()
+    fill_with_shuffled_threats(analyzer, 1500, hours=30, seed=2)
+
+    for hours in (1, 6, 12, 24, 48):
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
+        expected = [t for t in analyzer.threat_events if t.timestamp >= cutoff]
+        assert analyzer.get_recent_threats(hours) == expected
+
+def test_position_window_is_chronological_after_wrapping():
+    history = PositionHistory.empty(100)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for k in range(130):
+        history.append(SatellitePosition(
+            satellite_id=1, latitude=float(k), longitude=-float(k), altitude=400.0 + k,
+            velocity=7.5, timestamp=start + timedelta(seconds=k),
+        ))
+    assert history.count == 100 and history.head == 30
+
+    # The last 50 positions straddle the end of the buffer: slots 80-99 then 0-29
+    data, times = history.window(50)
+    np.testing.assert_array_equal(data[:, 0], np.arange(80, 130))
+    np.testing.assert_array_equal(data[:, 2], 400.0 + np.arange(80, 130))
+    expected = [np.datetime64((start + timedelta(seconds=k)).replace(tzinfo=None), "ns") for k in range(80, 130)]
+    np.testing.assert_array_equal(times, expected)
+
+    data, times = history.window(200)
+    np.testing.assert_array_equal(data[:, 0], np.arange(30, 130))
+    assert (np.diff(times) > np.timedelta64(0)).all()
@@ -0,0 +1,44 @@
+import time
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi.testclient import TestClient
+import threat_api
+from threat_analyzer import ThreatAnalyzer
+
+@pytest.fixture
+def non_utc_host(monkeypatch):
+    monkeypatch.setenv("TZ", "Asia/Tokyo")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(threat_api, "threat_analyzer", ThreatAnalyzer())
+    return TestClient(threat_api.app)
+
+def test_aware_position_timestamps_stay_in_the_24h_window(non_utc_host, client):
+    # The Node bridge posts new Date().toISOString(), i.e. UTC with a "Z" suffix
+    start = datetime.now(timezone.utc) - timedelta(hours=20)
+    for k in range(12):
+        response = client.post("/api/satellite-position", json={
+            "satellite_id": 1,
+            "latitude": 10.0 + 0.01 * k,
+            "longitude": 20.0,
+            "altitude": 400.0,
+            "velocity": 12.0 if k == 6 else 7.5,
+            "timestamp": (start + timedelta(seconds=k)).isoformat().replace("+00:00", "Z"),
+        })
+        assert response.status_code == 200
+
+    threats = client.get("/api/threats", params={"hours": 24}).json()
+    assert any(t["threat_type"] == "VELOCITY_ANOMALY" for t in threats)
+
+    for threat in threats:
+        timestamp = datetime.fromisoformat(threat["timestamp"])
+        assert timestamp.utcoffset() == timedelta(0)
+        assert start <= timestamp <= start + timedelta(seconds=11)
+
+    stats = client.get("/api/threat-stats").json()
+    assert stats["total_threats_24h"] == len(threats)
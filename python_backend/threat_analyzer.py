@@ -1,22 +1,35 @@
 import asyncio
 import json
+import time
+from bisect import bisect_left
+from collections import Counter, deque
+from itertools import islice
 import numpy as np
-import pandas as pd
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
-from sklearn.cluster import DBSCAN
-from sklearn.preprocessing import StandardScaler
+from scipy.spatial import cKDTree
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, List, Optional, Tuple
 from pydantic import BaseModel
 import websockets
-import requests
 from dataclasses import dataclass
+from enum import IntEnum
 import logging
+try:
+    # Ahead-of-time compiled kernel from build_kernels.py, if it has been built
+    from _threat_kernels import dbscan
+except ImportError:
+    from _dbscan_numba import dbscan
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+class Severity(IntEnum):
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+    CRITICAL = 4
+
+@dataclass(slots=True)
 class ThreatEvent:
     id: str
     timestamp: datetime
@@ -25,11 +38,11 @@ class ThreatEvent:
     target_lat: float
     target_lon: float
     threat_type: str
-    severity: str
+    severity: Severity
     satellite_id: Optional[int] = None
     description: str = ""
 
-@dataclass
+@dataclass(slots=True)
 class SatellitePosition:
     satellite_id: int
     latitude: float
@@ -38,112 +51,198 @@ class SatellitePosition:
     velocity: float
     timestamp: datetime
 
+@dataclass(slots=True)
+class PositionHistory:
+    """Ring buffer of a satellite's recent positions"""
+    buf: np.ndarray  # (capacity, 4) rows of lat, lon, alt, vel
+    times: np.ndarray  # (capacity,) datetime64[ns]
+    head: int = 0
+    count: int = 0
+
+    @classmethod
+    def empty(cls, capacity: int = 100) -> "PositionHistory":
+        return cls(
+            buf=np.zeros((capacity, 4), dtype=np.float64),
+            times=np.zeros(capacity, dtype="datetime64[ns]")
+        )
+
+    def append(self, position: SatellitePosition):
+        capacity = len(self.buf)
+        # datetime64 has no zone, so times are stored as naive UTC
+        timestamp = _as_utc(position.timestamp).replace(tzinfo=None)
+
+        self.buf[self.head] = (position.latitude, position.longitude, position.altitude, position.velocity)
+        self.times[self.head] = np.datetime64(timestamp, "ns")
+        self.head = (self.head + 1) % capacity
+        self.count = min(self.count + 1, capacity)
+
+    def window(self, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the last n positions and their times in chronological order"""
+        n = min(n, self.count)
+        if n <= self.head:
+            return self.buf[self.head - n:self.head], self.times[self.head - n:self.head]
+        idx = np.arange(self.head - n, self.head) % len(self.buf)
+        return self.buf[idx], self.times[idx]
+
+def _as_utc(timestamp: datetime) -> datetime:
+    """Return an aware UTC datetime; naive values are taken to be local time"""
+    return timestamp.astimezone(timezone.utc)
+
+def _to_datetime(value: np.datetime64) -> datetime:
+    return value.astype("datetime64[us]").item().replace(tzinfo=timezone.utc)
+
+def _to_cartesian(positions: np.ndarray) -> np.ndarray:
+    """Convert (N, 3) rows of lat, lon, alt to Cartesian (N, 3) coordinates in km"""
+    R = 6371  # Earth radius in km
+    
+    lat = np.radians(positions[:, 0])
+    lon = np.radians(positions[:, 1])
+    r = R + positions[:, 2]
+    
+    cos_lat = np.cos(lat)
+    # Kept in float64: cKDTree copies any other dtype to float64 on every rebuild
+    return np.stack([r * cos_lat * np.cos(lon), r * cos_lat * np.sin(lon), r * np.sin(lat)], -1)
+
 class ThreatAnalyzer:
     def __init__(self):
-        self.threat_events: List[ThreatEvent] = []
-        self.satellite_positions: Dict[int, List[SatellitePosition]] = {}
+        # Keep only last 1000 threats
+        self.threat_events: Deque[ThreatEvent] = deque(maxlen=1000)
+        # Running maximum of threat unix timestamps, parallel to threat_events
+        self._threat_times: Deque[float] = deque(maxlen=1000)
+        # Per-hour severity/type counts of the buffered threats, keyed by unix hour
+        self._sev_counts: Dict[int, Counter] = {}
+        self._type_counts: Dict[int, Counter] = {}
+        # The buffered threats of each hour, to count the partial hour at the 24h boundary
+        self._hourly_threats: Dict[int, List[ThreatEvent]] = {}
+        self.satellite_positions: Dict[int, PositionHistory] = {}
         self.threat_zones: List[Dict] = []
         self.communication_paths: List[Dict] = []
         self.anomaly_threshold = 0.7
+        # Latest (lat, lon, alt) per satellite, one row per entry in _sat_ids
+        self._pos_array: np.ndarray = np.empty((0, 3), dtype=np.float64)
+        self._sat_ids: np.ndarray = np.empty(0, dtype=np.int64)
+        self._sat_index: Dict[int, int] = {}
+        # Cartesian coordinates of _pos_array and a k-d tree over them, rebuilt lazily
+        self._xyz: Optional[np.ndarray] = None
+        self._tree: Optional[cKDTree] = None
+        # Memoized dashboard queries: key -> (computed_at, result)
+        self._cache: Dict[str, Tuple[float, object]] = {}
+        self._cache_ttl = 2.0
         
-    async def analyze_satellite_anomalies(self, positions: List[SatellitePosition]) -> List[ThreatEvent]:
-        """Analyze satellite positions for anomalies and potential threats"""
+    async def analyze_satellite_anomalies(self, sat_id: int) -> List[ThreatEvent]:
+        """Analyze a satellite's recent positions for anomalies and potential threats"""
         threats = []
         
-        for sat_id, pos_history in self.satellite_positions.items():
-            if len(pos_history) < 10:
-                continue
-                
-            # Convert to pandas DataFrame for analysis
-            df = pd.DataFrame([
-                {
-                    'lat': pos.latitude,
-                    'lon': pos.longitude,
-                    'alt': pos.altitude,
-                    'vel': pos.velocity,
-                    'timestamp': pos.timestamp
-                }
-                for pos in pos_history[-50:]  # Last 50 positions
-            ])
-            
-            # Detect velocity anomalies
-            velocity_anomalies = self._detect_velocity_anomalies(df, sat_id)
-            threats.extend(velocity_anomalies)
-            
-            # Detect trajectory anomalies
-            trajectory_anomalies = self._detect_trajectory_anomalies(df, sat_id)
-            threats.extend(trajectory_anomalies)
-            
-            # Detect proximity threats
-            proximity_threats = self._detect_proximity_threats(sat_id, pos_history[-1])
-            threats.extend(proximity_threats)
+        pos_history = self.satellite_positions.get(sat_id)
+        if pos_history is None or pos_history.count < 10:
+            return threats
             
+        # Copy the window so position updates can't change it under the worker thread
+        data, times = pos_history.window(50)  # Last 50 positions
+        data, times = data.copy(), times.copy()
+        
+        # Velocity and trajectory detection run off the event loop
+        window_anomalies = await asyncio.to_thread(self._detect_window_anomalies, data, times, sat_id)
+        threats.extend(window_anomalies)
+        
+        # Detect proximity threats
+        latest = data[-1]
+        current_pos = SatellitePosition(
+            satellite_id=sat_id,
+            latitude=float(latest[0]),
+            longitude=float(latest[1]),
+            altitude=float(latest[2]),
+            velocity=float(latest[3]),
+            timestamp=_to_datetime(times[-1])
+        )
+        proximity_threats = self._detect_proximity_threats(sat_id, current_pos)
+        threats.extend(proximity_threats)
+        
+        return threats
+    
+    def _detect_window_anomalies(self, data: np.ndarray, times: np.ndarray, sat_id: int) -> List[ThreatEvent]:
+        """Run the detectors that only need one satellite's position window"""
+        threats = []
+        
+        # Detect velocity anomalies
+        velocity_anomalies = self._detect_velocity_anomalies(data, times, sat_id)
+        threats.extend(velocity_anomalies)
+        
+        # Detect trajectory anomalies
+        trajectory_anomalies = self._detect_trajectory_anomalies(data, times, sat_id)
+        threats.extend(trajectory_anomalies)
+        
         return threats
     
-    def _detect_velocity_anomalies(self, df: pd.DataFrame, sat_id: int) -> List[ThreatEvent]:
+    def _detect_velocity_anomalies(self, data: np.ndarray, times: np.ndarray, sat_id: int) -> List[ThreatEvent]:
         """Detect unusual velocity changes"""
         threats = []
         
-        if len(df) < 5:
+        if len(data) < 5:
             return threats
             
         # Calculate velocity change rate
-        df['vel_change'] = df['vel'].diff()
+        vel_change = np.diff(data[:, 3])
         
         # Statistical anomaly detection
-        mean_change = df['vel_change'].mean()
-        std_change = df['vel_change'].std()
+        mean_change = vel_change.mean()
+        std_change = vel_change.std(ddof=1)
         
-        anomalies = df[abs(df['vel_change'] - mean_change) > (2 * std_change)]
+        # vel_change[k] is the change arriving at position k + 1
+        anomaly_indices = np.flatnonzero(np.abs(vel_change - mean_change) > (2 * std_change)) + 1
         
-        for _, row in anomalies.iterrows():
+        for idx in anomaly_indices:
+            lat, lon = float(data[idx, 0]), float(data[idx, 1])
+            timestamp = _to_datetime(times[idx])
             threat = ThreatEvent(
-                id=f"VEL_ANOMALY_{sat_id}_{int(row['timestamp'].timestamp())}",
-                timestamp=row['timestamp'],
-                source_lat=row['lat'],
-                source_lon=row['lon'],
-                target_lat=row['lat'],
-                target_lon=row['lon'],
+                id=f"VEL_ANOMALY_{sat_id}_{int(timestamp.timestamp())}",
+                timestamp=timestamp,
+                source_lat=lat,
+                source_lon=lon,
+                target_lat=lat,
+                target_lon=lon,
                 threat_type="VELOCITY_ANOMALY",
-                severity="MEDIUM",
+                severity=Severity.MEDIUM,
                 satellite_id=sat_id,
-                description=f"Unusual velocity change detected: {row['vel_change']:.2f} km/s"
+                description=f"Unusual velocity change detected: {vel_change[idx - 1]:.2f} km/s"
             )
             threats.append(threat)
             
         return threats
     
-    def _detect_trajectory_anomalies(self, df: pd.DataFrame, sat_id: int) -> List[ThreatEvent]:
+    def _detect_trajectory_anomalies(self, data: np.ndarray, times: np.ndarray, sat_id: int) -> List[ThreatEvent]:
         """Detect unusual trajectory patterns"""
         threats = []
         
-        if len(df) < 10:
+        if len(data) < 10:
             return threats
             
         # Use DBSCAN clustering to detect trajectory anomalies
-        features = df[['lat', 'lon', 'alt']].values
-        scaler = StandardScaler()
-        features_scaled = scaler.fit_transform(features)
+        # Standardize in place of sklearn's StandardScaler, centering only once
+        features_scaled = data[:, :3] - data[:, :3].mean(axis=0)
+        std = np.sqrt((features_scaled * features_scaled).mean(axis=0))
+        std[std == 0] = 1.0
+        features_scaled /= std
         
-        clustering = DBSCAN(eps=0.5, min_samples=3)
-        clusters = clustering.fit_predict(features_scaled)
+        clusters = dbscan(features_scaled, 0.5, 3)
         
         # Points labeled as -1 are anomalies
-        anomaly_indices = np.where(clusters == -1)[0]
+        anomaly_indices = np.flatnonzero(clusters == -1)
         
         for idx in anomaly_indices:
-            row = df.iloc[idx]
+            lat, lon = float(data[idx, 0]), float(data[idx, 1])
+            timestamp = _to_datetime(times[idx])
             threat = ThreatEvent(
-                id=f"TRAJ_ANOMALY_{sat_id}_{int(row['timestamp'].timestamp())}",
-                timestamp=row['timestamp'],
-                source_lat=row['lat'],
-                source_lon=row['lon'],
-                target_lat=row['lat'],
-                target_lon=row['lon'],
+                id=f"TRAJ_ANOMALY_{sat_id}_{int(timestamp.timestamp())}",
+                timestamp=timestamp,
+                source_lat=lat,
+                source_lon=lon,
+                target_lat=lat,
+                target_lon=lon,
                 threat_type="TRAJECTORY_ANOMALY",
-                severity="HIGH",
+                severity=Severity.HIGH,
                 satellite_id=sat_id,
-                description=f"Anomalous trajectory detected at position ({row['lat']:.2f}, {row['lon']:.2f})"
+                description=f"Anomalous trajectory detected at position ({lat:.2f}, {lon:.2f})"
             )
             threats.append(threat)
             
@@ -153,196 +252,265 @@ class ThreatAnalyzer:
         """Detect satellites in dangerously close proximity"""
         threats = []
         
-        for other_sat_id, pos_history in self.satellite_positions.items():
-            if other_sat_id == sat_id or not pos_history:
+        if sat_id not in self._sat_index:
+            return threats
+        
+        # Query with the analyzed position, which may be older than the satellite's latest
+        point = _to_cartesian(np.array([[current_pos.latitude, current_pos.longitude, current_pos.altitude]]))[0]
+        
+        # Only satellites inside the 100km ball need an exact distance
+        xyz, tree = self._spatial_index()
+        neighbors = np.asarray(tree.query_ball_point(point, r=100), dtype=np.intp)
+        distances = np.sqrt(((xyz[neighbors] - point) ** 2).sum(-1))
+        close = distances < 100
+        
+        # If satellites are within 100km, it's a potential collision threat
+        for k, distance in zip(neighbors[close], distances[close]):
+            other_sat_id = int(self._sat_ids[k])
+            if other_sat_id == sat_id:
                 continue
                 
-            other_pos = pos_history[-1]
-            
-            # Calculate 3D distance
-            distance = self._calculate_3d_distance(current_pos, other_pos)
-            
-            # If satellites are within 100km, it's a potential collision threat
-            if distance < 100:
-                threat = ThreatEvent(
-                    id=f"PROXIMITY_THREAT_{sat_id}_{other_sat_id}_{int(current_pos.timestamp.timestamp())}",
-                    timestamp=current_pos.timestamp,
-                    source_lat=current_pos.latitude,
-                    source_lon=current_pos.longitude,
-                    target_lat=other_pos.latitude,
-                    target_lon=other_pos.longitude,
-                    threat_type="PROXIMITY_THREAT",
-                    severity="CRITICAL",
-                    satellite_id=sat_id,
-                    description=f"Collision risk with satellite {other_sat_id}: {distance:.1f}km separation"
-                )
-                threats.append(threat)
+            threat = ThreatEvent(
+                id=f"PROXIMITY_THREAT_{sat_id}_{other_sat_id}_{int(current_pos.timestamp.timestamp())}",
+                timestamp=current_pos.timestamp,
+                source_lat=current_pos.latitude,
+                source_lon=current_pos.longitude,
+                target_lat=float(self._pos_array[k, 0]),
+                target_lon=float(self._pos_array[k, 1]),
+                threat_type="PROXIMITY_THREAT",
+                severity=Severity.CRITICAL,
+                satellite_id=sat_id,
+                description=f"Collision risk with satellite {other_sat_id}: {distance:.1f}km separation"
+            )
+            threats.append(threat)
                 
         return threats
     
-    def _calculate_3d_distance(self, pos1: SatellitePosition, pos2: SatellitePosition) -> float:
-        """Calculate 3D distance between two satellite positions"""
-        # Convert to Cartesian coordinates
-        R = 6371  # Earth radius in km
-        
-        lat1, lon1, alt1 = np.radians(pos1.latitude), np.radians(pos1.longitude), pos1.altitude
-        lat2, lon2, alt2 = np.radians(pos2.latitude), np.radians(pos2.longitude), pos2.altitude
-        
-        r1 = R + alt1
-        r2 = R + alt2
-        
-        x1 = r1 * np.cos(lat1) * np.cos(lon1)
-        y1 = r1 * np.cos(lat1) * np.sin(lon1)
-        z1 = r1 * np.sin(lat1)
-        
-        x2 = r2 * np.cos(lat2) * np.cos(lon2)
-        y2 = r2 * np.cos(lat2) * np.sin(lon2)
-        z2 = r2 * np.sin(lat2)
+    def _compute_all_cartesian(self) -> np.ndarray:
+        """Convert the latest position of every satellite to Cartesian (N, 3) coordinates"""
+        return _to_cartesian(self._pos_array)
+    
+    def _spatial_index(self) -> Tuple[np.ndarray, cKDTree]:
+        """Return the Cartesian coordinates of all satellites and a k-d tree over them"""
+        if self._tree is None:
+            self._xyz = self._compute_all_cartesian()
+            self._tree = cKDTree(self._xyz)
+        return self._xyz, self._tree
+    
+    def _cached(self, key: str, compute):
+        """Return a memoized result if it is younger than the cache TTL"""
+        now = time.monotonic()
+        entry = self._cache.get(key)
+        if entry is not None and now - entry[0] < self._cache_ttl:
+            return entry[1]
         
-        return np.sqrt((x2-x1)**2 + (y2-y1)**2 + (z2-z1)**2)
+        result = compute()
+        self._cache[key] = (now, result)
+        return result
+    
+    def _invalidate(self, *keys: str):
+        for key in keys:
+            self._cache.pop(key, None)
     
     def generate_threat_zones(self) -> List[Dict]:
         """Generate threat zones based on recent threat events"""
+        return self._cached('threat_zones', self._compute_threat_zones)
+    
+    def _compute_threat_zones(self) -> List[Dict]:
         zones = []
         
-        # Group threats by geographic region
-        threat_df = pd.DataFrame([
-            {
-                'lat': t.source_lat,
-                'lon': t.source_lon,
-                'severity': t.severity,
-                'type': t.threat_type
-            }
-            for t in self.threat_events[-100:]  # Last 100 threats
-        ])
+        # Last 100 threats
+        recent = list(islice(self.threat_events, max(len(self.threat_events) - 100, 0), None))
         
-        if len(threat_df) < 3:
+        if len(recent) < 3:
             return zones
             
+        # Group threats by geographic region
+        features = np.array([(t.source_lat, t.source_lon) for t in recent], dtype=np.float64)
+        severities = np.array([t.severity for t in recent], dtype=np.int8)
+        threat_types = np.array([t.threat_type for t in recent])
+        
         # Cluster threats geographically
-        features = threat_df[['lat', 'lon']].values
-        clustering = DBSCAN(eps=5, min_samples=3)  # 5-degree clustering
-        clusters = clustering.fit_predict(features)
+        clusters = dbscan(features, 5.0, 3)  # 5-degree clustering
         
         for cluster_id in np.unique(clusters):
             if cluster_id == -1:  # Skip noise
                 continue
                 
-            cluster_threats = threat_df[clusters == cluster_id]
+            members = clusters == cluster_id
             
             # Calculate zone center and radius
-            center_lat = cluster_threats['lat'].mean()
-            center_lon = cluster_threats['lon'].mean()
+            center_lat, center_lon = features[members].mean(axis=0)
             
-            # Determine severity based on threat types
-            severity_scores = {
-                'LOW': 1,
-                'MEDIUM': 2,
-                'HIGH': 3,
-                'CRITICAL': 4
-            }
+            # Determine severity from the average severity of the cluster
+            avg_severity = severities[members].mean()
+            zone_severity = Severity(int(np.digitize(avg_severity, [1.5, 2.5, 3.5])) + 1)
             
-            avg_severity = cluster_threats['severity'].map(severity_scores).mean()
-            zone_severity = 'LOW' if avg_severity < 1.5 else 'MEDIUM' if avg_severity < 2.5 else 'HIGH' if avg_severity < 3.5 else 'CRITICAL'
+            # Most frequent threat type, ties broken alphabetically
+            types, type_counts = np.unique(threat_types[members], return_counts=True)
             
             zones.append({
                 'id': f"ZONE_{cluster_id}",
-                'center_lat': center_lat,
-                'center_lon': center_lon,
+                'center_lat': float(center_lat),
+                'center_lon': float(center_lon),
                 'radius': 500,  # km
-                'severity': zone_severity,
-                'threat_count': len(cluster_threats),
-                'dominant_threat': cluster_threats['type'].mode().iloc[0]
+                'severity': zone_severity.name,
+                'threat_count': int(members.sum()),
+                'dominant_threat': str(types[np.argmax(type_counts)])
             })
             
         return zones
     
     def generate_communication_paths(self) -> List[Dict]:
         """Generate communication paths between satellites"""
-        paths = []
-        
-        # Get current positions of all satellites
-        current_positions = {}
-        for sat_id, pos_history in self.satellite_positions.items():
-            if pos_history:
-                current_positions[sat_id] = pos_history[-1]
-        
-        # Generate paths between satellites within communication range
-        sat_ids = list(current_positions.keys())
-        for i in range(len(sat_ids)):
-            for j in range(i + 1, len(sat_ids)):
-                sat1_id, sat2_id = sat_ids[i], sat_ids[j]
-                pos1, pos2 = current_positions[sat1_id], current_positions[sat2_id]
-                
-                distance = self._calculate_3d_distance(pos1, pos2)
-                
-                # Communication possible within 2000km
-                if distance < 2000:
-                    # Determine link quality based on distance
-                    quality = "EXCELLENT" if distance < 500 else "GOOD" if distance < 1000 else "POOR"
-                    
-                    paths.append({
-                        'id': f"LINK_{sat1_id}_{sat2_id}",
-                        'source_id': sat1_id,
-                        'target_id': sat2_id,
-                        'source_lat': pos1.latitude,
-                        'source_lon': pos1.longitude,
-                        'target_lat': pos2.latitude,
-                        'target_lon': pos2.longitude,
-                        'distance': distance,
-                        'quality': quality,
-                        'active': True
-                    })
-                    
-        return paths
+        return self._cached('communication_paths', self._compute_communication_paths)
+    
+    def _compute_communication_paths(self) -> List[Dict]:
+        if len(self._sat_ids) < 2:
+            return []
+        
+        xyz, tree = self._spatial_index()
+        
+        # Communication possible within 2000km
+        pairs = tree.query_pairs(r=2000, output_type='ndarray')
+        pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+        iu, ju = pairs[:, 0], pairs[:, 1]
+        pair_distances = np.sqrt(((xyz[iu] - xyz[ju]) ** 2).sum(-1))
+        in_range = pair_distances < 2000
+        iu, ju, pair_distances = iu[in_range], ju[in_range], pair_distances[in_range]
+        
+        # Determine link quality based on distance
+        qualities = np.select(
+            [pair_distances < 500, pair_distances < 1000],
+            ["EXCELLENT", "GOOD"],
+            default="POOR"
+        )
+        
+        source_ids, target_ids = self._sat_ids[iu].tolist(), self._sat_ids[ju].tolist()
+        sources, targets = self._pos_array[iu].tolist(), self._pos_array[ju].tolist()
+        
+        return [
+            {
+                'id': f"LINK_{source_id}_{target_id}",
+                'source_id': source_id,
+                'target_id': target_id,
+                'source_lat': source[0],
+                'source_lon': source[1],
+                'target_lat': target[0],
+                'target_lon': target[1],
+                'distance': distance,
+                'quality': quality,
+                'active': True
+            }
+            for source_id, target_id, source, target, distance, quality in zip(
+                source_ids, target_ids, sources, targets, pair_distances.tolist(), qualities.tolist()
+            )
+        ]
     
     def update_satellite_position(self, position: SatellitePosition):
         """Update satellite position history"""
         if position.satellite_id not in self.satellite_positions:
-            self.satellite_positions[position.satellite_id] = []
+            # Keep only last 100 positions per satellite
+            self.satellite_positions[position.satellite_id] = PositionHistory.empty(100)
         
         self.satellite_positions[position.satellite_id].append(position)
+        self._invalidate('communication_paths', 'threat_statistics')
         
-        # Keep only last 100 positions per satellite
-        if len(self.satellite_positions[position.satellite_id]) > 100:
-            self.satellite_positions[position.satellite_id] = self.satellite_positions[position.satellite_id][-100:]
+        # Keep the latest-position array in sync
+        row = (position.latitude, position.longitude, position.altitude)
+        if position.satellite_id not in self._sat_index:
+            self._sat_index[position.satellite_id] = len(self._sat_ids)
+            self._pos_array = np.vstack([self._pos_array, row])
+            self._sat_ids = np.append(self._sat_ids, position.satellite_id)
+        else:
+            self._pos_array[self._sat_index[position.satellite_id]] = row
+        self._xyz = None
+        self._tree = None
     
     def add_threat_event(self, threat: ThreatEvent):
         """Add a new threat event"""
+        # All threat times are aware UTC so they compare against the UTC cutoffs
+        threat.timestamp = _as_utc(threat.timestamp)
+        
+        if len(self.threat_events) == self.threat_events.maxlen:
+            # The oldest threat is about to be evicted
+            self._count_threat(self.threat_events[0], -1)
+        
         self.threat_events.append(threat)
+        self._count_threat(threat, 1)
         
-        # Keep only last 1000 threats
-        if len(self.threat_events) > 1000:
-            self.threat_events = self.threat_events[-1000:]
+        timestamp = threat.timestamp.timestamp()
+        if self._threat_times:
+            timestamp = max(timestamp, self._threat_times[-1])
+        self._threat_times.append(timestamp)
+        self._invalidate('threat_zones', 'threat_statistics')
+    
+    def _count_threat(self, threat: ThreatEvent, delta: int):
+        """Adjust the hourly severity and type counters for one threat"""
+        hour = int(threat.timestamp.timestamp() // 3600)
+        
+        if delta > 0:
+            self._hourly_threats.setdefault(hour, []).append(threat)
+        else:
+            hour_threats = self._hourly_threats[hour]
+            hour_threats.remove(threat)
+            if not hour_threats:
+                del self._hourly_threats[hour]
+        
+        for counts, key in ((self._sev_counts, threat.severity), (self._type_counts, threat.threat_type)):
+            bucket = counts.setdefault(hour, Counter())
+            bucket[key] += delta
+            if bucket[key] <= 0:
+                del bucket[key]
+                if not bucket:
+                    del counts[hour]
     
     def get_recent_threats(self, hours: int = 24) -> List[ThreatEvent]:
         """Get threats from the last N hours"""
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        return [t for t in self.threat_events if t.timestamp >= cutoff_time]
+        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
+        
+        # Every threat before start is older than the cutoff; later ones still need the
+        # check because anomaly threats can carry timestamps older than earlier threats
+        start = bisect_left(self._threat_times, cutoff_time.timestamp())
+        return [t for t in islice(self.threat_events, start, None) if t.timestamp >= cutoff_time]
     
     def get_threat_statistics(self) -> Dict:
         """Get threat statistics for dashboard"""
-        recent_threats = self.get_recent_threats(24)
+        return self._cached('threat_statistics', self._compute_threat_statistics)
+    
+    def _compute_threat_statistics(self) -> Dict:
+        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=24)
+        boundary_hour = int(cutoff_time.timestamp() // 3600)
+        
+        # Hours after the boundary hour lie entirely inside the last 24 hours
+        severity_counts = Counter()
+        for hour, counts in self._sev_counts.items():
+            if hour > boundary_hour:
+                severity_counts.update(counts)
+        
+        type_counts = Counter()
+        for hour, counts in self._type_counts.items():
+            if hour > boundary_hour:
+                type_counts.update(counts)
+        
+        # The boundary hour straddles the cutoff, so check its threats one by one
+        for threat in self._hourly_threats.get(boundary_hour, ()):
+            if threat.timestamp >= cutoff_time:
+                severity_counts[threat.severity] += 1
+                type_counts[threat.threat_type] += 1
         
         stats = {
-            'total_threats_24h': len(recent_threats),
-            'critical_threats': len([t for t in recent_threats if t.severity == 'CRITICAL']),
-            'high_threats': len([t for t in recent_threats if t.severity == 'HIGH']),
-            'medium_threats': len([t for t in recent_threats if t.severity == 'MEDIUM']),
-            'low_threats': len([t for t in recent_threats if t.severity == 'LOW']),
-            'threat_by_type': {},
+            'total_threats_24h': sum(severity_counts.values()),
+            'critical_threats': severity_counts[Severity.CRITICAL],
+            'high_threats': severity_counts[Severity.HIGH],
+            'medium_threats': severity_counts[Severity.MEDIUM],
+            'low_threats': severity_counts[Severity.LOW],
+            'threat_by_type': dict(type_counts),
             'active_satellites': len(self.satellite_positions),
             'threat_zones': len(self.generate_threat_zones()),
             'communication_links': len(self.generate_communication_paths())
         }
         
-        # Count by threat type
-        for threat in recent_threats:
-            threat_type = threat.threat_type
-            if threat_type not in stats['threat_by_type']:
-                stats['threat_by_type'][threat_type] = 0
-            stats['threat_by_type'][threat_type] += 1
-        
         return stats
 
 # Global threat analyzer instance
@@ -1,13 +1,14 @@
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 import asyncio
-import json
+import orjson
 import uvicorn
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
-from threat_analyzer import threat_analyzer, ThreatEvent, SatellitePosition
+from threat_analyzer import threat_analyzer, ThreatEvent, SatellitePosition, Severity
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -77,88 +78,78 @@ class ConnectionManager:
         logger.info(f"WebSocket connection established. Total connections: {len(self.active_connections)}")
 
     def disconnect(self, websocket: WebSocket):
+        if websocket not in self.active_connections:
+            return
         self.active_connections.remove(websocket)
         logger.info(f"WebSocket connection closed. Total connections: {len(self.active_connections)}")
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
         await websocket.send_text(message)
 
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except:
-                # Remove disconnected connections
-                self.active_connections.remove(connection)
+    async def broadcast(self, message: bytes):
+        """Send one pre-encoded frame to all clients concurrently"""
+        connections = list(self.active_connections)
+        if not connections:
+            return
+        
+        results = await asyncio.gather(
+            *(connection.send_bytes(message) for connection in connections),
+            return_exceptions=True
+        )
+        
+        # Remove disconnected connections
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.disconnect(connection)
 
 manager = ConnectionManager()
 
+def encode_message(message: Dict) -> bytes:
+    """Serialize a WebSocket message to JSON bytes"""
+    return orjson.dumps(message, option=orjson.OPT_SERIALIZE_NUMPY)
+
+def threat_to_dict(threat: ThreatEvent) -> Dict:
+    """Convert a threat event to its API and WebSocket payload"""
+    return {
+        "id": threat.id,
+        "timestamp": threat.timestamp.isoformat(),
+        "source_lat": threat.source_lat,
+        "source_lon": threat.source_lon,
+        "target_lat": threat.target_lat,
+        "target_lon": threat.target_lon,
+        "threat_type": threat.threat_type,
+        "severity": threat.severity.name,
+        "satellite_id": threat.satellite_id,
+        "description": threat.description
+    }
+
 # API Endpoints
 @app.get("/")
 async def root():
     return {"message": "Cyberpunk Satellite Threat API", "status": "operational"}
 
-@app.get("/api/threats", response_model=List[ThreatEventModel])
+# Read endpoints return plain dicts as ORJSONResponse directly, which skips
+# re-validating every item; response_model still documents the schema
+@app.get("/api/threats", response_model=List[ThreatEventModel], response_class=ORJSONResponse)
 async def get_threats(hours: int = 24):
     """Get recent threat events"""
     threats = threat_analyzer.get_recent_threats(hours)
-    return [
-        ThreatEventModel(
-            id=t.id,
-            timestamp=t.timestamp,
-            source_lat=t.source_lat,
-            source_lon=t.source_lon,
-            target_lat=t.target_lat,
-            target_lon=t.target_lon,
-            threat_type=t.threat_type,
-            severity=t.severity,
-            satellite_id=t.satellite_id,
-            description=t.description
-        )
-        for t in threats
-    ]
+    return ORJSONResponse([threat_to_dict(t) for t in threats])
 
-@app.get("/api/threat-zones", response_model=List[ThreatZoneModel])
+@app.get("/api/threat-zones", response_model=List[ThreatZoneModel], response_class=ORJSONResponse)
 async def get_threat_zones():
     """Get active threat zones"""
-    zones = threat_analyzer.generate_threat_zones()
-    return [
-        ThreatZoneModel(
-            id=zone['id'],
-            center_lat=zone['center_lat'],
-            center_lon=zone['center_lon'],
-            radius=zone['radius'],
-            severity=zone['severity'],
-            threat_count=zone['threat_count'],
-            dominant_threat=zone['dominant_threat']
-        )
-        for zone in zones
-    ]
+    return ORJSONResponse(threat_analyzer.generate_threat_zones())
 
-@app.get("/api/communication-paths", response_model=List[CommunicationPathModel])
+@app.get("/api/communication-paths", response_model=List[CommunicationPathModel], response_class=ORJSONResponse)
 async def get_communication_paths():
     """Get active communication paths between satellites"""
-    paths = threat_analyzer.generate_communication_paths()
-    return [
-        CommunicationPathModel(
-            id=path['id'],
-            source_id=path['source_id'],
-            target_id=path['target_id'],
-            source_lat=path['source_lat'],
-            source_lon=path['source_lon'],
-            target_lat=path['target_lat'],
-            target_lon=path['target_lon'],
-            distance=path['distance'],
-            quality=path['quality'],
-            active=path['active']
-        )
-        for path in paths
-    ]
+    return ORJSONResponse(threat_analyzer.generate_communication_paths())
 
-@app.get("/api/threat-stats")
+@app.get("/api/threat-stats", response_class=ORJSONResponse)
 async def get_threat_statistics():
     """Get threat statistics for dashboard"""
-    return threat_analyzer.get_threat_statistics()
+    return ORJSONResponse(threat_analyzer.get_threat_statistics())
 
 @app.post("/api/satellite-position")
 async def update_satellite_position(position: SatellitePositionModel):
@@ -176,31 +167,19 @@ async def update_satellite_position(position: SatellitePositionModel):
     threat_analyzer.update_satellite_position(sat_pos)
     
     # Analyze for new threats
-    new_threats = await threat_analyzer.analyze_satellite_anomalies([sat_pos])
+    new_threats = await threat_analyzer.analyze_satellite_anomalies(sat_pos.satellite_id)
     
     # Add new threats to analyzer
     for threat in new_threats:
         threat_analyzer.add_threat_event(threat)
     
-    # Broadcast new threats via WebSocket
+    # Broadcast all new threats via WebSocket in a single frame
     if new_threats:
-        for threat in new_threats:
-            threat_data = {
-                "type": "new_threat",
-                "data": {
-                    "id": threat.id,
-                    "timestamp": threat.timestamp.isoformat(),
-                    "source_lat": threat.source_lat,
-                    "source_lon": threat.source_lon,
-                    "target_lat": threat.target_lat,
-                    "target_lon": threat.target_lon,
-                    "threat_type": threat.threat_type,
-                    "severity": threat.severity,
-                    "satellite_id": threat.satellite_id,
-                    "description": threat.description
-                }
-            }
-            await manager.broadcast(json.dumps(threat_data))
+        threat_data = {
+            "type": "new_threats",
+            "data": [threat_to_dict(threat) for threat in new_threats]
+        }
+        await manager.broadcast(encode_message(threat_data))
     
     return {"status": "success", "new_threats": len(new_threats)}
 
@@ -219,21 +198,27 @@ async def websocket_endpoint(websocket: WebSocket):
                 "stats": threat_analyzer.get_threat_statistics()
             }
         }
-        await websocket.send_text(json.dumps(initial_data))
+        await websocket.send_bytes(encode_message(initial_data))
         
+        # Keep connection alive; periodic updates come from broadcast_stats_updates
         while True:
-            # Keep connection alive and send periodic updates
-            await asyncio.sleep(30)
+            await websocket.receive_text()
             
-            # Send updated statistics
+    except WebSocketDisconnect:
+        manager.disconnect(websocket)
+
+# Background task for sending statistics to all clients
+async def broadcast_stats_updates():
+    """Broadcast updated threat statistics every 30 seconds"""
+    while True:
+        await asyncio.sleep(30)
+        
+        if manager.active_connections:
             stats_update = {
                 "type": "stats_update",
                 "data": threat_analyzer.get_threat_statistics()
             }
-            await websocket.send_text(json.dumps(stats_update))
-            
-    except WebSocketDisconnect:
-        manager.disconnect(websocket)
+            await manager.broadcast(encode_message(stats_update))
 
 # Background task for generating simulated threats
 async def generate_simulated_threats():
@@ -245,11 +230,11 @@ async def generate_simulated_threats():
         
         # Generate random threat
         threat_types = ["VELOCITY_ANOMALY", "TRAJECTORY_ANOMALY", "PROXIMITY_THREAT", "COMMUNICATION_LOSS", "DEBRIS_FIELD"]
-        severities = ["LOW", "MEDIUM", "HIGH", "CRITICAL"]
+        severities = list(Severity)
         
         threat = ThreatEvent(
             id=f"SIM_{int(datetime.now().timestamp())}",
-            timestamp=datetime.now(),
+            timestamp=datetime.now(timezone.utc),
             source_lat=random.uniform(-90, 90),
             source_lon=random.uniform(-180, 180),
             target_lat=random.uniform(-90, 90),
@@ -265,25 +250,15 @@ async def generate_simulated_threats():
         # Broadcast to all connected clients
         threat_data = {
             "type": "new_threat",
-            "data": {
-                "id": threat.id,
-                "timestamp": threat.timestamp.isoformat(),
-                "source_lat": threat.source_lat,
-                "source_lon": threat.source_lon,
-                "target_lat": threat.target_lat,
-                "target_lon": threat.target_lon,
-                "threat_type": threat.threat_type,
-                "severity": threat.severity,
-                "satellite_id": threat.satellite_id,
-                "description": threat.description
-            }
+            "data": threat_to_dict(threat)
         }
-        await manager.broadcast(json.dumps(threat_data))
+        await manager.broadcast(encode_message(threat_data))
 
-# Start background task
+# Start background tasks
 @app.on_event("startup")
 async def startup_event():
     asyncio.create_task(generate_simulated_threats())
+    asyncio.create_task(broadcast_stats_updates())
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
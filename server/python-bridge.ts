@@ -119,6 +119,11 @@ class PythonBridge {
           if (message.type === 'new_threat') {
             const threatEvent: ThreatEvent = message.data;
             this.threatEventHandlers.forEach(handler => handler(threatEvent));
+          } else if (message.type === 'new_threats') {
+            const threatEvents: ThreatEvent[] = message.data;
+            threatEvents.forEach(threatEvent => {
+              this.threatEventHandlers.forEach(handler => handler(threatEvent));
+            });
           } else if (message.type === 'stats_update') {
             const stats: ThreatStats = message.data;
             this.statsUpdateHandlers.forEach(handler => handler(stats));